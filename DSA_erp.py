@@ -1,3 +1,8 @@
+import functools
+import hashlib
+import inspect
+import os
+import re
 import pandas as pd
 from abc import ABC, abstractmethod
 import dash
@@ -11,6 +16,61 @@ import plotly.express as px
 import plotly.graph_objects as go
 
 
+# On-disk memoization of ingested and processed frames
+CACHE_DIR = '.cache'
+
+
+def parquet_cache(key_func):
+    """Memoize a DataFrame-returning method to Parquet under CACHE_DIR.
+
+    ``key_func`` receives the method's arguments and returns the parts the
+    cache key is built from, or None to bypass the cache.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args):
+            parts = key_func(self, *args)
+            if parts is None:
+                return func(self, *args)
+
+            key = hashlib.md5(repr(parts).encode()).hexdigest()
+            path = os.path.join(CACHE_DIR, f'{key}.parquet')
+            if os.path.exists(path):
+                result = pd.read_parquet(path)
+            else:
+                result = func(self, *args)
+                tmp_path = path + '.tmp'
+                try:
+                    os.makedirs(CACHE_DIR, exist_ok=True)
+                    result.to_parquet(tmp_path)
+                    os.replace(tmp_path, path)
+                except (ImportError, ValueError, TypeError, OSError):
+                    # No Parquet engine installed or a frame it can't store;
+                    # fall back to recomputing on the next run
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+
+            return result
+        return wrapper
+    return decorator
+
+
+def content_hash(data):
+    # Hash of a frame's values, index, column names and dtypes, in row order
+    digest = hashlib.md5(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    digest.update(repr(list(zip(data.columns, map(str, data.dtypes)))).encode())
+    return digest.hexdigest()
+
+
+def code_version(cls):
+    # Hash of a class's source, so cached results go stale when its code changes
+    try:
+        source = inspect.getsource(cls)
+    except (OSError, TypeError):
+        source = cls.__qualname__
+    return hashlib.md5(source.encode()).hexdigest()
+
+
 # Interface for data ingestion
 class DataIngestionStrategy(ABC):
     @abstractmethod
@@ -19,8 +79,68 @@ class DataIngestionStrategy(ABC):
 
 # Concrete class for CSV data ingestion
 class CSVDataIngestion(DataIngestionStrategy):
+    # Low-cardinality text columns are loaded as categories
+    default_dtype = {'Segment': 'category', 'Country': 'category',
+                     'Product': 'category', 'Discount Band': 'category'}
+    # Amounts stored as currency text, e.g. "$1,618.50 "
+    default_currency_columns = ['Units Sold', 'Manufacturing Price', 'Sale Price', 'Gross Sales',
+                                'Discounts', 'Sales', 'COGS', 'Profit']
+
+    def __init__(self, dtype=None, parse_dates=None, usecols=None, chunksize=None, currency_columns=None):
+        self.dtype = dict(self.default_dtype) if dtype is None else dtype
+        self.parse_dates = ['Date'] if parse_dates is None else parse_dates
+        self.usecols = usecols
+        self.chunksize = chunksize
+        self.currency_columns = (list(self.default_currency_columns) if currency_columns is None
+                                 else currency_columns)
+
+    def read_options(self):
+        return {'dtype': self.dtype, 'parse_dates': self.parse_dates, 'usecols': self.usecols,
+                'chunksize': self.chunksize, 'currency_columns': self.currency_columns}
+
+    def date_columns(self):
+        # Only parse the date columns that usecols actually loads; callables
+        # and positional usecols can't be checked by name, so pass those as is
+        if (self.usecols is None or callable(self.usecols) or not isinstance(self.parse_dates, list)
+                or not all(isinstance(col, str) for col in self.usecols)):
+            return self.parse_dates
+        return [col for col in self.parse_dates if col in self.usecols]
+
+    @staticmethod
+    def parse_currency(col):
+        # Strip currency symbols and commas column-wise, then coerce to float.
+        # Accounting notation: '-' is zero and '(x)' is -x; blank cells, or
+        # anything else non-numeric, become NaN
+        cleaned = (col.astype(str)
+                   .str.replace(',', '', regex=False)
+                   .str.replace('$', '', regex=False)
+                   .str.strip()
+                   .replace({'-': '0', '': np.nan}))
+        negative = cleaned.str.startswith('(', na=False) & cleaned.str.endswith(')', na=False)
+        cleaned = cleaned.str.strip('()').str.strip()
+        values = pd.to_numeric(cleaned, errors='coerce')
+        return values.where(~negative, -values)
+
+    @parquet_cache(lambda self, file_path: (os.path.abspath(file_path), os.path.getmtime(file_path),
+                                            self.__class__.__name__, code_version(type(self)),
+                                            self.read_options()))
     def ingest_data(self, file_path):
-        return pd.read_csv(file_path)
+        options = dict(parse_dates=self.date_columns(), usecols=self.usecols, engine='c', low_memory=False)
+        if self.chunksize is None:
+            data = pd.read_csv(file_path, dtype=self.dtype, **options)
+        else:
+            # Categories would differ between chunks and decay to object on
+            # concat, so apply the dtypes once to the combined frame
+            chunks = pd.read_csv(file_path, chunksize=self.chunksize, **options)
+            data = pd.concat(chunks, ignore_index=True)
+            data = data.astype({col: dt for col, dt in (self.dtype or {}).items() if col in data.columns})
+
+        # Convert the amounts once here, so no strategy has to do it (or
+        # change its input) later on
+        currency_columns = [col for col in self.currency_columns if col in data.columns]
+        if currency_columns:
+            data[currency_columns] = data[currency_columns].apply(self.parse_currency)
+        return data
 
 
 # Context class for data ingestion
@@ -43,28 +163,22 @@ class DataProcess(ABC):
 
 class SalesTrendsOverTime(DataProcess):
     def process_data(self, data):
-        # Ensure 'Date' is in datetime format
-        data['Date'] = pd.to_datetime(data['Date'])
-
-        # Group by year and month, then sum the sales
-        grouped = data.groupby([data['Date'].dt.year.rename('Year'), data['Date'].dt.month.rename('Month')])[
-            'Sales'].sum().reset_index(name='TotalSales')
+        # 'Date' is parsed to datetime at ingestion; group on a single
+        # monthly period key, then sum the sales
+        grouped = data.groupby(data['Date'].dt.to_period('M'), sort=True)['Sales'].sum().reset_index(name='TotalSales')
 
-        # Reconstructing the 'Date' column for ease of plotting
-        grouped['Date'] = pd.to_datetime(grouped.assign(DAY=1)[['Year', 'Month', 'DAY']])
-
-        # Ensure 'Date' is the first column if needed
-        cols = ['Date'] + [col for col in grouped.columns if col != 'Date']
-        return grouped[cols]
+        # Turn the periods back into timestamps for ease of plotting
+        grouped['Date'] = grouped['Date'].dt.to_timestamp()
+        return grouped
 
 
 class ProfitAnalysisByCountry(DataProcess):
     def process_data(self, data):
-        return data.groupby('Country')['Profit'].sum().reset_index()
+        return data.groupby('Country', sort=False, observed=True)['Profit'].sum().reset_index()
 
 class ProductPerformance(DataProcess):
     def process_data(self, data):
-        return data.groupby('Product')[['Sales', 'Profit']].sum().reset_index()
+        return data.groupby('Product', sort=False, observed=True)[['Sales', 'Profit']].sum().reset_index()
 
 class DiscountImpactOnSales(DataProcess):
     def process_data(self, data):
@@ -72,32 +186,30 @@ class DiscountImpactOnSales(DataProcess):
 
 class MonthlySalesDistribution(DataProcess):
     def process_data(self, data):
-        data['Date'] = pd.to_datetime(data['Date'])
         return data.groupby(data['Date'].dt.month)['Sales'].sum().reset_index(name='MonthlySales')
 
 
 class CountryWiseSalesDistribution(DataProcess):
     def process_data(self, data):
-        return data.groupby('Country')['Sales'].sum().reset_index()
+        return data.groupby('Country', sort=False, observed=True)['Sales'].sum().reset_index()
 
 
 class CorrelationAnalysis(DataProcess):
-    def process_data(self, data):
-        # Updated function to handle non-convertible strings
-        def convert_currency(val):
-            try:
-                # Removing currency symbols and commas
-                val = val.replace(',', '').replace('$', '')
-                # Converting to float or returning NaN for non-convertible values
-                return float(val) if val.strip() != '' and val.strip() != '-' else np.nan
-            except Exception as e:
-                return np.nan  # Return NaN for any other conversion errors
+    columns = ['Units Sold', 'Manufacturing Price', 'Sale Price', 'Gross Sales', 'Discounts', 'Sales', 'Profit']
 
-        # Apply conversion on all specified columns
-        for col in ['Units Sold', 'Manufacturing Price', 'Sale Price', 'Gross Sales', 'Discounts', 'Sales', 'Profit']:
-            data[col] = data[col].apply(convert_currency)
+    def process_data(self, data):
+        # Pearson correlation as one float32 matrix product over the complete
+        # rows, normalised by the column norms of the centred matrix. The
+        # columns arrive as floats from ingestion with only truly missing
+        # cells as NaN, so dropna keeps every row of Financials.csv
+        values = data[self.columns].dropna().to_numpy(dtype=np.float32)
+        centred = values - values.mean(axis=0)
+        cov = centred.T @ centred
+        norms = np.sqrt(np.diag(cov))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = cov / np.outer(norms, norms)
 
-        return data[['Units Sold', 'Manufacturing Price', 'Sale Price', 'Gross Sales', 'Discounts', 'Sales', 'Profit']].corr()
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
 
 
 
@@ -108,8 +220,18 @@ class DataProcessingContext:
     def set_strategy(self, strategy: DataProcess):
         self._strategy = strategy
 
+    # Keyed on the input's content, so subsets and in-place edits of a frame
+    # never pick up another frame's result
+    @parquet_cache(lambda self, data: (content_hash(data), self._strategy.__class__.__name__,
+                                       code_version(type(self._strategy)), code_version(type(self))))
     def process(self, data):
-        return self._strategy.process_data(data)
+        result = self._strategy.process_data(data)
+
+        # Keep every numeric column backed by its own C-contiguous array
+        result = result.copy(deep=False)
+        for col in result.select_dtypes('number').columns:
+            result[col] = np.ascontiguousarray(result[col].to_numpy())
+        return result
 
 
 
@@ -123,10 +245,10 @@ sales_trends_data = data_processing_context.process(sales_data)
 data_processing_context.set_strategy(ProfitAnalysisByCountry())
 profit_by_country_data = data_processing_context.process(sales_data)
 
-data_processing_context = DataProcessingContext(ProductPerformance())
+data_processing_context.set_strategy(ProductPerformance())
 product_performance_data = data_processing_context.process(sales_data)
 
-data_processing_context = DataProcessingContext(DiscountImpactOnSales())
+data_processing_context.set_strategy(DiscountImpactOnSales())
 discount_impact_data = data_processing_context.process(sales_data)
 
 data_processing_context.set_strategy(CountryWiseSalesDistribution())
@@ -136,6 +258,89 @@ data_processing_context.set_strategy(CorrelationAnalysis())
 correlation_analysis_data = data_processing_context.process(sales_data)
 
 
+# Number of table rows sent to the browser per page
+PAGE_SIZE = 10
+
+# Copy of the sales data for the table, with floats cut to display precision;
+# the strategies above keep working on the full-precision sales_data
+display_data = sales_data.copy()
+float_columns = display_data.select_dtypes('float').columns
+display_data[float_columns] = display_data[float_columns].round(2)
+
+# One DataTable filter_query clause: '{column} op value'. The column name is
+# matched first, so operator spellings inside it (the 'le ' in 'Sale Price')
+# are never taken for the operator. Dash may prefix the operator with 's'
+# (case-sensitive) or 'i' (case-insensitive)
+FILTER_CLAUSE = re.compile(r'\s*\{(?P<name>[^}]*)\}\s*(?P<case>[si]?)'
+                           r'(?P<operator>>=|<=|!=|<|>|=|(?:ge|le|lt|gt|ne|eq|contains|datestartswith)(?![a-z]))'
+                           r'\s*(?P<value>.*?)\s*$', re.DOTALL)
+
+OPERATOR_NAMES = {'>=': 'ge', '<=': 'le', '<': 'lt', '>': 'gt', '!=': 'ne', '=': 'eq'}
+
+COMPARISONS = {'ge': np.greater_equal, 'le': np.less_equal, 'lt': np.less, 'gt': np.greater,
+               'ne': np.not_equal, 'eq': np.equal}
+
+
+def split_filter_part(filter_part):
+    # Split one '{column} op value' clause into (column, op, value, ignore_case)
+    match = FILTER_CLAUSE.match(filter_part)
+    if match is None:
+        return None, None, None, False
+
+    operator = OPERATOR_NAMES.get(match['operator'], match['operator'])
+    value = match['value']
+    quote = value[:1]
+    if len(value) > 1 and quote in ('\'', '"', '`') and value[-1] == quote:
+        value = value[1:-1].replace('\\' + quote, quote)
+    return match['name'], operator, value, match['case'] == 'i'
+
+
+def filter_mask(data, filter_query):
+    # Boolean row mask for a DataTable filter_query, built column by column
+    mask = np.ones(len(data), dtype=bool)
+    for filter_part in (filter_query or '').split(' && '):
+        name, operator, value, ignore_case = split_filter_part(filter_part)
+        if name not in data.columns:
+            continue
+
+        col = data[name]
+        if operator in COMPARISONS:
+            try:
+                if pd.api.types.is_numeric_dtype(col):
+                    values, value = col.to_numpy(dtype=np.float64), float(value)
+                elif pd.api.types.is_datetime64_any_dtype(col):
+                    values, value = col.to_numpy(), pd.Timestamp(value).to_datetime64()
+                elif ignore_case:
+                    values, value = col.astype(str).str.lower().to_numpy(), value.lower()
+                else:
+                    values = col.astype(str).to_numpy()
+            except ValueError:
+                # A value that can't be compared with the column matches nothing
+                mask[:] = False
+                continue
+            mask &= COMPARISONS[operator](values, value)
+        elif operator == 'contains':
+            mask &= col.astype(str).str.contains(value, case=not ignore_case, regex=False).to_numpy()
+        elif operator == 'datestartswith':
+            mask &= col.astype(str).str.startswith(value).to_numpy()
+
+    return mask
+
+
+def sort_indices(data, sort_by):
+    # Stable multi-column order for a DataTable sort_by; np.lexsort treats
+    # its last key as the primary one, so the keys are added in reverse
+    keys = []
+    for sort in reversed(sort_by):
+        col = data[sort['column_id']]
+        if pd.api.types.is_numeric_dtype(col):
+            key = col.to_numpy(dtype=np.float64)
+        else:
+            key = pd.factorize(col, sort=True)[0]
+        keys.append(-key if sort['direction'] == 'desc' else key)
+
+    return np.lexsort(keys)
+
 # Initialize the Dash app
 app = dash.Dash(__name__)
 
@@ -159,12 +364,15 @@ app.layout = html.Div(children=[
     dash_table.DataTable(
         id='table',
         columns=[{"name": i, "id": i} for i in sales_data.columns],  # Columns to be updated in the callback
-        data=sales_data.to_dict('records'),
-        filter_action='native',  # Enable filtering
-        sort_action='native',  # Enable sorting
+        # Rows are filtered, sorted and paged on the server by update_table_page
+        filter_action='custom',  # Enable filtering
+        sort_action='custom',  # Enable sorting
         sort_mode='multi',  # Allow multi-column sorting
-        page_action='native',  # Enable pagination
-        page_size=10,  # Number of rows per page
+        page_action='custom',  # Server-side pagination
+        page_current=0,
+        page_size=PAGE_SIZE,  # Number of rows per page
+        sort_by=[],
+        filter_query='',
     ),
 
     # Dynamic Chart
@@ -198,6 +406,36 @@ app.layout = html.Div(children=[
 def update_table_columns(selected_columns):
     return [{"name": i, "id": i} for i in selected_columns]
 
+def table_rows(filter_query, sort_by):
+    # display_data filtered and sorted the way the table currently shows it
+    mask = filter_mask(display_data, filter_query)
+    dff = display_data if mask.all() else display_data.iloc[np.flatnonzero(mask)]
+
+    if sort_by:
+        dff = dff.iloc[sort_indices(dff, sort_by)]
+    return dff
+
+# Callback to filter, sort and serve only the requested page of table rows
+@app.callback(
+    [Output('table', 'data'),
+     Output('table', 'page_count'),
+     Output('table', 'page_current')],
+    [Input('table', 'page_current'),
+     Input('table', 'page_size'),
+     Input('table', 'sort_by'),
+     Input('table', 'filter_query')]
+)
+def update_table_page(page_current, page_size, sort_by, filter_query):
+    dff = table_rows(filter_query, sort_by)
+
+    # A filter can leave fewer pages than the one being shown; move back to
+    # the last page that still has rows
+    page_count = max(1, -(-len(dff) // page_size))
+    page_current = min(page_current or 0, page_count - 1)
+
+    start = page_current * page_size
+    return dff.iloc[start:start + page_size].to_dict('records'), page_count, page_current
+
 # Callback to uncheck all checklist options
 @app.callback(
     Output('column-selector', 'value'),
@@ -209,30 +447,30 @@ def uncheck_all_columns(n_clicks):
         return []
     raise dash.exceptions.PreventUpdate
 
-# Callback to update the dynamic chart based on the table's data and selected columns
+# Callback to update the dynamic chart based on the table's filter, sort and selected columns
 @app.callback(
     Output('dynamic-chart', 'figure'),
-    [Input('table', 'derived_virtual_data'),
+    [Input('table', 'filter_query'),
+     Input('table', 'sort_by'),
      Input('column-selector', 'value')]
 )
-def update_dynamic_chart(rows, selected_columns):
-    if rows is None:
-        return {'data': []}
-
-    dff = pd.DataFrame(rows)
-
+def update_dynamic_chart(filter_query, sort_by, selected_columns):
     if selected_columns is None or not selected_columns:
         return {'data': []}
 
-    data = []
-    for column in selected_columns:
-        if dff[column].dtype in ['float64', 'int64']:
-            data.append({
-                'x': dff.index,
-                'y': dff[column],
-                'type': 'line',
-                'name': column
-            })
+    # The table only holds the current page, so chart every filtered and
+    # sorted row from the server-side data instead
+    dff = table_rows(filter_query, sort_by)
+
+    # Look numeric columns up once and test membership against a set
+    numeric_columns = set(dff.select_dtypes('number').columns)
+    x = np.arange(len(dff))
+    data = [{
+        'x': x,
+        'y': dff[column].to_numpy(),
+        'type': 'line',
+        'name': column
+    } for column in selected_columns if column in numeric_columns]
 
     return {
         'data': data,
@@ -244,82 +482,71 @@ def update_dynamic_chart(rows, selected_columns):
     }
 
 
+# The processed data is static, so every chart figure is built once up front
+FIGURES = {
+    'sales-trends': go.Figure(
+        data=[go.Scatter(x=sales_trends_data['Date'].to_numpy(), y=sales_trends_data['TotalSales'].to_numpy(),
+                         mode='lines')],
+        layout={'title': 'Sales Trends Over Time'}
+    ),
+    'profit-by-country': go.Figure(
+        data=[go.Bar(x=profit_by_country_data['Country'].to_numpy(), y=profit_by_country_data['Profit'].to_numpy())],
+        layout={'title': 'Profit Analysis by Country'}
+    ),
+    'product-performance': go.Figure(
+        data=[
+            go.Bar(x=product_performance_data['Product'].to_numpy(), y=product_performance_data['Sales'].to_numpy(), name='Sales'),
+            go.Bar(x=product_performance_data['Product'].to_numpy(), y=product_performance_data['Profit'].to_numpy(), name='Profit'),
+        ],
+        layout={
+            'title': 'Product Performance',
+            'barmode': 'stack'
+        }
+    ),
+    'country-wise-sales': go.Figure(
+        data=[
+            go.Bar(x=country_wise_sales_data['Country'].to_numpy(), y=country_wise_sales_data['Sales'].to_numpy(), name='Sales by Country'),
+        ],
+        layout={
+            'title': 'Country-wise Sales Distribution',
+            'xaxis': {'title': 'Country'},
+            'yaxis': {'title': 'Total Sales'}
+        }
+    ),
+    'discount-impact': go.Figure(
+        data=[
+            go.Scatter(x=discount_impact_data['Discount Band'].to_numpy(), y=discount_impact_data['Sales'].to_numpy(),
+                       mode='markers', name='Discount Impact on Sales'),
+        ],
+        layout={
+            'title': 'Discount Impact on Sales'
+        }
+    ),
+    'correlation-analysis': go.Figure(
+        data=[
+            go.Heatmap(
+                z=np.ascontiguousarray(correlation_analysis_data.values, dtype=np.float32),
+                x=correlation_analysis_data.columns.to_numpy(),
+                y=correlation_analysis_data.index.to_numpy(),
+                colorscale='Viridis',
+            )
+        ],
+        layout={
+            'title': 'Correlation Analysis',
+            'xaxis': {'title': 'Variables'},
+            'yaxis': {'title': 'Variables'},
+        }
+    ),
+}
+
+
 @app.callback(
     Output('selected-chart-container', 'children'),
     Input('chart-selector', 'value')
 )
 def display_selected_chart(chart_value):
-    if chart_value == 'sales-trends':
-        return dcc.Graph(
-            figure={
-                'data': [{'x': sales_trends_data['Date'], 'y': sales_trends_data['TotalSales'], 'type': 'line'}],
-                'layout': {'title': 'Sales Trends Over Time'}
-            }
-        )
-    elif chart_value == 'profit-by-country':
-        return dcc.Graph(
-            figure={
-                'data': [{'x': profit_by_country_data['Country'], 'y': profit_by_country_data['Profit'], 'type': 'bar'}],
-                'layout': {'title': 'Profit Analysis by Country'}
-            }
-        )
-    elif chart_value == 'product-performance':
-        return dcc.Graph(
-            figure={
-                'data': [
-                    {'x': product_performance_data['Product'], 'y': product_performance_data['Sales'], 'type': 'bar', 'name': 'Sales'},
-                    {'x': product_performance_data['Product'], 'y': product_performance_data['Profit'], 'type': 'bar', 'name': 'Profit'},
-                ],
-                'layout': {
-                    'title': 'Product Performance',
-                    'barmode': 'stack'
-                }
-            }
-        )
-    elif chart_value == 'country-wise-sales':
-        return dcc.Graph(
-            figure={
-                'data': [
-                    {'x': country_wise_sales_data['Country'], 'y': country_wise_sales_data['Sales'], 'type': 'bar', 'name': 'Sales by Country'},
-                ],
-                'layout': {
-                    'title': 'Country-wise Sales Distribution',
-                    'xaxis': {'title': 'Country'},
-                    'yaxis': {'title': 'Total Sales'}
-                }
-            }
-        )
-    elif chart_value == 'discount-impact':
-        return dcc.Graph(
-        figure={
-            'data': [
-                {'x': discount_impact_data['Discount Band'], 'y': discount_impact_data['Sales'], 'mode': 'markers', 'type': 'scatter', 'name': 'Discount Impact on Sales'},
-            ],
-            'layout': {
-                'title': 'Discount Impact on Sales'
-            }
-        }
-    )
-    elif chart_value == 'correlation-analysis':
-        return dcc.Graph(
-            figure={
-                'data': [
-                    {
-                        'z': correlation_analysis_data.values,
-                        'x': correlation_analysis_data.columns,
-                        'y': correlation_analysis_data.index,
-                        'type': 'heatmap',
-                        'colorscale': 'Viridis',
-                    }
-                ],
-                'layout': {
-                    'title': 'Correlation Analysis',
-                    'xaxis': {'title': 'Variables'},
-                    'yaxis': {'title': 'Variables'},
-                }
-            }
-        )
-    # Add more elif blocks for other chart values...
+    if chart_value in FIGURES:
+        return dcc.Graph(figure=FIGURES[chart_value])
     else:
         return "Please select a chart."
 
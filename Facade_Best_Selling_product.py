@@ -7,10 +7,10 @@ class DataInjuctor:
     def __init__(self, file_path):
         self.file_path = file_path
 
-    def load_data(self):
-        # Load data from CSV file into a pandas DataFrame
+    def load_data(self, usecols=None):
+        # Load data (optionally only some columns) from CSV file into a pandas DataFrame
         if os.path.exists(self.file_path):
-            df = pd.read_csv(self.file_path)
+            df = pd.read_csv(self.file_path, usecols=usecols)
             return df
         else:
             raise FileNotFoundError(f"The file {self.file_path} does not exist.")
@@ -20,10 +20,9 @@ class ProductAnalyzer:
     def __init__(self, df):
         self.df = df
 
-    def get_best_selling_products(self):
-        # Get best-selling products (sorted by units sold)
-        sorted_df = self.df.sort_values(by="units_sold", ascending=False)
-        return sorted_df
+    def get_best_selling_products(self, k=20):
+        # Get the top k best-selling products (by units sold) without a full sort
+        return self.df.nlargest(k, "units_sold")
 
 # Subsystem 3: Plotter
 class ChartPlotter:
@@ -44,13 +43,12 @@ class ChartPlotter:
 class ProductAnalysisFacade:
     def __init__(self, file_path):
         self.data_loader = DataInjuctor(file_path)
-        self.df = self.data_loader.load_data()
+        self.df = self.data_loader.load_data(usecols=["product", "units_sold"])
         self.analyzer = ProductAnalyzer(self.df)
-        self.plotter = ChartPlotter(self.df)
 
-    def analyze_and_plot_best_selling_products(self):
-        best_selling_products = self.analyzer.get_best_selling_products()
-        self.plotter.plot_best_selling_products()
+    def analyze_and_plot_best_selling_products(self, k=20):
+        best_selling_products = self.analyzer.get_best_selling_products(k)
+        ChartPlotter(best_selling_products).plot_best_selling_products()
 
 # Usage
 if __name__ == "__main__":
@@ -1,19 +1,35 @@
+import numpy as np
+
+
 class Order:
-    item =[]
-    quantities =[]
-    price =[]
-    status ="open"
+    def __init__(self):
+        # Per-instance storage; quantities and prices are kept as parallel
+        # float64 buffers that grow by doubling
+        self.item = []
+        self.q = np.empty(4, dtype=np.float64)
+        self.p = np.empty(4, dtype=np.float64)
+        self.size = 0
+        self.status = "open"
 
     def add_item(self, name, quantity, price):
+        if self.size == self.q.size:
+            self.q = np.resize(self.q, self.size * 2)
+            self.p = np.resize(self.p, self.size * 2)
         self.item.append(name)
-        self.quantities.append(quantity)
-        self.price.append(price)
+        self.q[self.size] = quantity
+        self.p[self.size] = price
+        self.size += 1
+
+    @property
+    def quantities(self):
+        return self.q[:self.size]
+
+    @property
+    def price(self):
+        return self.p[:self.size]
 
     def total_price(self):
-        total = 0;
-        for i in range(len(self.price)):
-            total += self.quantities[i] * self.price[i]
-        return total
+        return float(np.dot(self.quantities, self.price))
 
     def pay (self, payment_type, security_code):
 
@@ -1,22 +1,26 @@
+import threading
+
+
 class Logger(object):
     _instance = None
+    _lock = threading.Lock()
 
-    def __init__(self):
-        raise RuntimeError('Call instance() instead')
+    def __new__(cls):
+        # Double-checked locking: only the first construction takes the lock
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(Logger, cls).__new__(cls)
+                    # Put any initialization here.
+        return cls._instance
 
     @classmethod
     def instance(cls):
-        if cls._instance is None:
-            print('Creating new instance')
-            cls._instance = cls.__new__(cls)
-            # Put any initialization here.
-        return cls._instance
-    
-log = Logger()
-log1 = Logger.instance()
+        return cls()
+
+
+log1 = Logger()
 print(log1)
 log2 = Logger.instance()
 print(log2)
 print('Are they the same object?', log1 is log2)
-
-
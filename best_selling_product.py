@@ -1,22 +1,15 @@
-def best_selling_analysis(self):
-        # Open the CSV file for reading
-        with open('supermarket_sales2.csv', 'r') as file:
-            reader = csv.reader(file)
-            sales_data = list(reader)
+import pandas as pd
+
 
-        product_sales = {}
+def best_selling_analysis(self):
+        # Read only the Product ID (col 2) and Sales amount (col 7) columns
+        sales_data = pd.read_csv('supermarket_sales2.csv', usecols=[2, 7], dtype={2: str})
+        sales_data.columns = ['product_id', 'sales_amount']
+        sales_data['sales_amount'] = sales_data['sales_amount'].astype('float64')
 
-        for row in sales_data[1:]:
-            product_id = row[2]  # Product ID
-            sales_amount = float(row[7])  # Sales amount
-            # Accumulate sales amount for each product
-            if product_id in product_sales:
-                product_sales[product_id] += sales_amount
-            else:
-                product_sales[product_id] = sales_amount
+        # Accumulate sales amount for each product (no need to sort the groups)
+        product_sales = sales_data.groupby('product_id', sort=False)['sales_amount'].sum()
 
-        # Sort products by total sales amount in descending order
-        sorted_products = sorted(product_sales.items(), key=lambda x: x[1], reverse=True)
-        # Get the top 5 best-selling products
-        top_products = [product[0] for product in sorted_products[:5]]
+        # Get the top 5 best-selling products without sorting every product
+        top_products = product_sales.nlargest(5).index.tolist()
         print(top_products)